@@ -15,13 +15,19 @@ from typing import Any, Dict, List, Optional
 
 import paho.mqtt.client as mqtt_client
 
-from .auth import DEFAULT_USER_AGENT, PND_BASE_URL, PlaywrightAuthClient
+from .auth import (
+    CHROMIUM_LAUNCH_ARGS,
+    DEFAULT_USER_AGENT,
+    PND_BASE_URL,
+    PlaywrightAuthClient,
+)
 from .dip_client import DipClient
 from .mqtt_publisher import MqttPublisher
 from .orchestrator import Orchestrator, OrchestratorConfig, SessionExpiredError
 from .session_manager import CredentialsProvider, SessionStore
 
 PND_DATA_URL = "https://pnd.cezdistribuce.cz/cezpnd2/external/data"
+JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class PndFetchError(Exception):
@@ -39,6 +45,17 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+async def _body_preview(response: Any, limit: int = 500) -> str:
+    """Decode only the first `limit` bytes of a response body for logging."""
+    try:
+        body: bytes = await response.body()
+    except Exception:
+        return "(body unavailable)"
+    if not body:
+        return "(empty)"
+    return body[:limit].decode("utf-8", errors="replace")
+
+
 def _get_async_playwright():  # type: ignore[no-untyped-def]
     from playwright.async_api import async_playwright  # type: ignore[import-not-found]
 
@@ -87,7 +104,7 @@ class PndFetcher:
     ) -> Dict[str, Any]:
         async_playwright = _get_async_playwright()
         async with async_playwright() as pw:
-            browser = await pw.chromium.launch(headless=True)
+            browser = await pw.chromium.launch(headless=True, args=CHROMIUM_LAUNCH_ARGS)
             context = await self._create_browser_context(browser)
             try:
                 await context.add_cookies(cookies)
@@ -96,13 +113,22 @@ class PndFetcher:
                 logger.debug("Navigating to PND dashboard for WAF fingerprint...")
                 try:
                     page = await context.new_page()
-                    await page.goto(
-                        "https://pnd.cezdistribuce.cz/cezpnd2/dashboard/view",
-                        wait_until="domcontentloaded",
-                        timeout=30_000,
-                    )
-                    await page.close()
-                    await asyncio.sleep(3)
+                    try:
+                        await page.goto(
+                            "https://pnd.cezdistribuce.cz/cezpnd2/dashboard/view",
+                            wait_until="domcontentloaded",
+                            timeout=30_000,
+                        )
+                        # Let the dashboard's session bootstrap requests settle
+                        # instead of sleeping a fixed 3 s; never wait longer.
+                        try:
+                            await page.wait_for_load_state("networkidle", timeout=3_000)
+                        except Exception as e:
+                            logger.debug(
+                                "PND dashboard not network-idle (non-fatal): %s", e
+                            )
+                    finally:
+                        await page.close()
                 except Exception as e:
                     logger.debug("PND dashboard navigation failed (non-fatal): %s", e)
 
@@ -122,7 +148,7 @@ class PndFetcher:
                     warmup_response = await context.request.post(
                         PND_DATA_URL,
                         data=json.dumps(form_payload),
-                        headers={"Content-Type": "application/json"},
+                        headers=JSON_HEADERS,
                     )
                     logger.debug(
                         "Warmup status: %d (expected 400)", warmup_response.status
@@ -158,12 +184,13 @@ class PndFetcher:
         from datetime import datetime, timedelta
 
         today = datetime.now()
-        date_from = today.strftime("%d.%m.%Y 00:00")
-        date_to = today.strftime("%d.%m.%Y 23:59")
+        today_str = today.strftime("%d.%m.%Y")
+        date_from = f"{today_str} 00:00"
+        date_to = f"{today_str} 23:59"
 
         async_playwright = _get_async_playwright()
         async with async_playwright() as pw:
-            browser = await pw.chromium.launch(headless=True)
+            browser = await pw.chromium.launch(headless=True, args=CHROMIUM_LAUNCH_ARGS)
             context = await self._create_browser_context(browser)
             try:
                 await context.add_cookies(cookies)
@@ -192,7 +219,7 @@ class PndFetcher:
                     warmup_response = await context.request.post(
                         PND_DATA_URL,
                         data=json.dumps(warmup_payload),
-                        headers={"Content-Type": "application/json"},
+                        headers=JSON_HEADERS,
                     )
                     logger.debug(
                         "Warmup status: %d (expected 400)", warmup_response.status
@@ -228,15 +255,16 @@ class PndFetcher:
                             "Assembly %s has no data for today, retrying yesterday",
                             assembly_name,
                         )
-                        date_obj = today - timedelta(days=1)
-                        yesterday_from = date_obj.strftime("%d.%m.%Y 00:00")
+                        yesterday_str = (today - timedelta(days=1)).strftime("%d.%m.%Y")
+                        yesterday_from = f"{yesterday_str} 00:00"
+                        yesterday_to = date_from
                         try:
                             payload = await self._fetch_one_in_context(
                                 context,
                                 meter_id,
                                 assembly_id,
                                 yesterday_from,
-                                date_from,
+                                yesterday_to,
                             )
                         except Exception as e:
                             logger.error(
@@ -288,14 +316,10 @@ class PndFetcher:
             headers_dict.get("content-type", "") if hasattr(headers_dict, "get") else ""
         )
         if "application/json" not in content_type.lower():
-            try:
-                text = await response.text()
-            except Exception:
-                text = "(body unavailable)"
             logger.warning(
                 "PND fetch returned non-JSON response (Content-Type: %s): %s",
                 content_type,
-                text[:500] if text else "(empty)",
+                await _body_preview(response),
             )
             raise PndFetchError(
                 f"PND fetch returned non-JSON response (Content-Type: {content_type})"
@@ -304,14 +328,10 @@ class PndFetcher:
         try:
             data: Dict[str, Any] = await response.json()
         except Exception as e:
-            try:
-                text = await response.text()
-            except Exception:
-                text = "(body unavailable)"
             logger.warning(
                 "PND fetch JSON parse failed: %s, response: %s",
                 e,
-                text[:500] if text else "(empty)",
+                await _body_preview(response),
             )
             raise PndFetchError(f"PND fetch JSON parse failed: {e}")
 
@@ -315,8 +315,9 @@ class Orchestrator:
 
         results = {}
         today = datetime.now()
-        date_from = today.strftime("%d.%m.%Y 00:00")
-        date_to = today.strftime("%d.%m.%Y 23:59")
+        today_str = today.strftime("%d.%m.%Y")
+        date_from = f"{today_str} 00:00"
+        date_to = f"{today_str} 23:59"
 
         for config in ASSEMBLY_CONFIGS:
             try:
@@ -122,18 +122,21 @@ class SessionStore:
         state = SessionState(
             cookies=cookies, created_at=timestamp, expires_at=expires_at
         )
+        payload = json.dumps(
+            {
+                "cookies": cookies,
+                "created_at": timestamp.isoformat(),
+                "expires_at": expires_at.isoformat() if expires_at else None,
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
         self._path.parent.mkdir(parents=True, exist_ok=True)
-        with self._path.open("w", encoding="utf-8") as handle:
-            json.dump(
-                {
-                    "cookies": cookies,
-                    "created_at": timestamp.isoformat(),
-                    "expires_at": expires_at.isoformat() if expires_at else None,
-                },
-                handle,
-                ensure_ascii=False,
-                indent=2,
-            )
+        # Write the whole file at once and rename it into place, so a crash
+        # mid-write never leaves a truncated session file behind.
+        tmp_path = self._path.with_name(f"{self._path.name}.tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, self._path)
         return state
 
     def is_expired(self, state: SessionState, now: datetime | None = None) -> bool:
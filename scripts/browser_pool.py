@@ -0,0 +1,74 @@
+"""Shared Chromium for the live scripts.
+
+Start one long-lived browser in a separate terminal:
+
+    python3 -m scripts.browser_pool
+
+and point the scripts at it:
+
+    export CEZ_CDP_ENDPOINT="http://127.0.0.1:9222"
+
+Each script then only pays for new_context() instead of a Chromium cold
+start. Without CEZ_CDP_ENDPOINT every script launches its own browser.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from playwright.async_api import async_playwright
+
+from addon.src.auth import CHROMIUM_LAUNCH_ARGS
+
+CDP_ENDPOINT_ENV = "CEZ_CDP_ENDPOINT"
+DEFAULT_CDP_PORT = 9222
+
+
+@asynccontextmanager
+async def shared_browser(playwright: Any) -> AsyncIterator[Any]:
+    """Yield the shared browser when one is running, else launch a private one."""
+    endpoint = os.getenv(CDP_ENDPOINT_ENV)
+    if endpoint:
+        browser = await playwright.chromium.connect_over_cdp(endpoint)
+    else:
+        browser = await playwright.chromium.launch(
+            headless=True, args=CHROMIUM_LAUNCH_ARGS
+        )
+    try:
+        yield browser
+    finally:
+        # On a CDP connection this only drops our contexts and disconnects;
+        # the shared browser keeps running for the next script.
+        await browser.close()
+
+
+async def serve(port: int = DEFAULT_CDP_PORT) -> None:
+    """Run a headless Chromium with a CDP endpoint until interrupted."""
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(
+            headless=True,
+            args=[*CHROMIUM_LAUNCH_ARGS, f"--remote-debugging-port={port}"],
+        )
+        print(f'export {CDP_ENDPOINT_ENV}="http://127.0.0.1:{port}"')
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await browser.close()
+
+
+def main() -> int:
+    """Entry point."""
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CDP_PORT
+    try:
+        asyncio.run(serve(port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
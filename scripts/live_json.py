@@ -0,0 +1,41 @@
+"""JSON helpers shared by the live scripts.
+
+orjson is used when installed (optional); stdlib json is the fallback and
+produces the same output for the payloads and evidence these scripts handle.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is the fallback
+    orjson = None
+
+
+def loads_json(data: bytes) -> Any:
+    """Parse JSON bytes; both backends raise ValueError subclasses on bad input."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_compact(data: Any) -> str:
+    """Serialize a request payload as compact JSON text."""
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def dumps_evidence(data: dict) -> bytes:
+    """Serialize evidence as indented UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def body_preview(body: bytes, limit: int) -> str:
+    """Decode only the first `limit` bytes of a response body for display."""
+    return body[:limit].decode("utf-8", errors="replace")
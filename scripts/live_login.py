@@ -0,0 +1,120 @@
+"""Login helpers shared by the live scripts.
+
+live_verify_flow.py and test_shared_context_hypothesis.py drive the same
+CAS login and PND dashboard visit; both use the helpers here so a fix to
+the flow lands in one place.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from typing import Any
+
+from addon.src.auth import DEFAULT_USER_AGENT, LOGIN_SUCCESS_PATTERN
+
+PND_ENTRY_URL = "https://pnd.cezdistribuce.cz/cezpnd2"
+PND_DASHBOARD_URL = "https://pnd.cezdistribuce.cz/cezpnd2/dashboard/view"
+DIP_FALLBACK_URL = "https://dip.cezdistribuce.cz/irj/portal?zpnd"
+USERNAME_SELECTOR = 'input[name="username"]'
+PASSWORD_SELECTOR = 'input[name="password"]'
+SUBMIT_SELECTOR = 'input[type="submit"], button[type="submit"]'
+LOG_LEVEL_ENV = "CEZ_LOG"
+
+logger = logging.getLogger("cez.live")
+
+
+def configure_logging() -> None:
+    """Set up logging for a live script; CEZ_LOG=INFO/DEBUG shows the flow.
+
+    An unknown CEZ_LOG value falls back to WARNING instead of aborting.
+    """
+    name = (os.getenv(LOG_LEVEL_ENV) or "WARNING").strip().upper()
+    if hasattr(logging, "getLevelNamesMapping"):
+        level = logging.getLevelNamesMapping().get(name)
+    else:  # Python < 3.11: getLevelName() maps known names to ints
+        level = logging.getLevelName(name)
+    if not isinstance(level, int):
+        level = None
+    logging.basicConfig(
+        level=logging.WARNING if level is None else level,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    if level is None:
+        logger.warning("Unknown %s level %r, using WARNING", LOG_LEVEL_ENV, name)
+
+
+def context_options() -> dict:
+    """Browser context options for the live scripts (NO viewport)."""
+    return {
+        "user_agent": DEFAULT_USER_AGENT,
+        "locale": "cs-CZ",
+        "timezone_id": "Europe/Prague",
+    }
+
+
+async def find_login_frame(page: Any) -> Any:
+    """Return the page or child frame that hosts the login form.
+
+    The main frame is checked with a single locator call; child frames are
+    only scanned when the form is not there, all of them concurrently.
+    """
+    if await page.locator(USERNAME_SELECTOR).count() > 0:
+        return page
+    frames = [frame for frame in page.frames if frame is not page.main_frame]
+    # A frame that detaches mid-count raises; treat it as "no form here".
+    counts = await asyncio.gather(
+        *(frame.locator(USERNAME_SELECTOR).count() for frame in frames),
+        return_exceptions=True,
+    )
+    for frame, count in zip(frames, counts):
+        if isinstance(count, int) and count > 0:
+            return frame
+    return page
+
+
+async def login(page: Any, email: str, password: str) -> None:
+    """Run the CAS login flow on `page` and wait for the post-login redirect."""
+    logger.debug("Navigating to %s", PND_ENTRY_URL)
+    await page.goto(PND_ENTRY_URL, wait_until="domcontentloaded")
+
+    try:
+        await page.wait_for_selector(USERNAME_SELECTOR, timeout=30_000)
+    except Exception:
+        logger.info("Login form not on PND, trying %s", DIP_FALLBACK_URL)
+        await page.goto(DIP_FALLBACK_URL, wait_until="domcontentloaded")
+        await page.wait_for_selector(USERNAME_SELECTOR, timeout=120_000)
+
+    # Find login form (might be in iframe)
+    login_target = await find_login_frame(page)
+
+    logger.debug("Filling login form")
+    await login_target.fill(USERNAME_SELECTOR, email)
+    await login_target.fill(PASSWORD_SELECTOR, password)
+    logger.info("Submitting login form")
+    await login_target.locator(SUBMIT_SELECTOR).first.click()
+
+    await page.wait_for_url(LOGIN_SUCCESS_PATTERN, timeout=120_000)
+    logger.info("Login redirect reached %s", page.url)
+
+
+async def open_dashboard(page: Any) -> bool:
+    """Load the PND dashboard and report whether the session is logged in.
+
+    The dashboard visit is what establishes the PND session for the API
+    calls, so it runs after every login as well as for a cached session.
+    """
+    logger.debug("Navigating to %s", PND_DASHBOARD_URL)
+    await page.goto(PND_DASHBOARD_URL, wait_until="domcontentloaded")
+    # Wait for the dashboard's session bootstrap requests to settle
+    # instead of sleeping a fixed 5 s.
+    try:
+        await page.wait_for_load_state("networkidle", timeout=10_000)
+    except Exception:
+        logger.warning("Dashboard did not reach network idle, continuing")
+    # An expired session is redirected to the CAS login form.
+    return (
+        page.url.startswith(PND_DASHBOARD_URL)
+        and await page.locator(USERNAME_SELECTOR).count() == 0
+    )
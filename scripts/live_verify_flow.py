@@ -5,25 +5,48 @@ Usage:
     export CEZ_PASSWORD="your-password"
     export CEZ_ELECTROMETER_ID="784703"
     export CEZ_EAN="1234567890123"  # Optional
+    export CEZ_LOG="INFO"  # Optional: log the login flow (default WARNING)
 
     python3 scripts/live_verify_flow.py
+
+orjson is used for JSON handling when installed (optional).
+
+After a successful login the browser storage state (session cookies and
+localStorage) is cached per account in .cache/ for 30 minutes, so repeated
+PND-only runs skip the login flow. Runs with CEZ_EAN set always log in fresh:
+the DIP/HDO endpoints reject a context rebuilt from stored cookies. Delete the
+cache file to force a fresh login.
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
+import hashlib
 import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
+from typing import Any
 
 from playwright.async_api import async_playwright
 
-from addon.src.auth import DEFAULT_USER_AGENT
+from addon.src.auth import block_heavy_resources
 from scripts import live_verify_rules as validation
-
+from scripts.browser_pool import shared_browser
+from scripts.live_json import body_preview, dumps_compact, dumps_evidence, loads_json
+from scripts.live_login import (
+    configure_logging,
+    context_options,
+    login,
+    open_dashboard,
+)
+
+EVIDENCE_DIR = Path("evidence/live-fetch")
+STORAGE_STATE_DIR = Path(".cache")
+STORAGE_STATE_TTL_SECONDS = 30 * 60
 PND_DATA_URL = "https://pnd.cezdistribuce.cz/cezpnd2/external/data"
+JSON_HEADERS = {"Content-Type": "application/json"}
 DIP_PORTAL_URL = "https://dip.cezdistribuce.cz/irj/portal"
 DIP_TOKEN_PATH = "rest-auth-api?path=/token/get"
 DIP_SIGNALS_PATH = "prehled-om?path=supply-point-detail/signals/{ean}"
@@ -36,9 +59,44 @@ def get_timestamp() -> str:
 
 def ensure_evidence_dir() -> Path:
     """Create evidence directory if not exists."""
-    evidence_dir = Path("evidence/live-fetch")
-    evidence_dir.mkdir(parents=True, exist_ok=True)
-    return evidence_dir
+    EVIDENCE_DIR.mkdir(parents=True, exist_ok=True)
+    return EVIDENCE_DIR
+
+
+def storage_state_path(email: str) -> Path:
+    """Return the storage state cache file for the given account."""
+    digest = hashlib.sha256(email.strip().lower().encode()).hexdigest()[:16]
+    return STORAGE_STATE_DIR / f"cez_storage_state_{digest}.json"
+
+
+def load_cached_storage_state(email: str) -> str | None:
+    """Return the account's cached storage state path if it is younger than the TTL."""
+    path = storage_state_path(email)
+    try:
+        age = time.time() - path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    if age > STORAGE_STATE_TTL_SECONDS:
+        return None
+    return str(path)
+
+
+async def save_storage_state(context: Any, email: str) -> None:
+    """Cache the context's cookies and localStorage for the account's next run."""
+    path = storage_state_path(email)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    await context.storage_state(path=str(path))
+
+
+def write_evidence(path: Path, data: dict) -> None:
+    """Write evidence JSON with a single write and an atomic rename.
+
+    An interrupted run leaves at most a stray .tmp file, never a truncated
+    evidence file that validate_json_file() would choke on.
+    """
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_bytes(dumps_evidence(data))
+    os.replace(tmp_path, path)
 
 
 def build_pnd_payload(
@@ -78,82 +136,57 @@ async def async_main() -> int:
     print()
 
     try:
-        async with async_playwright() as playwright:
+        async with async_playwright() as pw, shared_browser(pw) as browser:
             # Step 1: Launch browser and login
             print("Step 1: Playwright login...")
-            browser = await playwright.chromium.launch(headless=True)
+            # A restored session is enough for PND, but DIP/HDO rejects a
+            # context built from stored cookies (HYP Test A), so an EAN run
+            # always logs in fresh.
+            storage_state = None if ean else load_cached_storage_state(email)
             context = await browser.new_context(
-                user_agent=DEFAULT_USER_AGENT,
-                locale="cs-CZ",
-                timezone_id="Europe/Prague",
+                **context_options(), storage_state=storage_state
             )
+            await block_heavy_resources(context)
             page = await context.new_page()
 
-            # Navigate to PND
-            await page.goto(
-                "https://pnd.cezdistribuce.cz/cezpnd2", wait_until="domcontentloaded"
-            )
+            logged_in = False
+            if storage_state:
+                logged_in = await open_dashboard(page)
+                if logged_in:
+                    print(f"✓ Reused cached session from {storage_state}")
+                else:
+                    print("  Cached session expired, logging in again")
+                    await context.clear_cookies()
 
-            try:
-                await page.wait_for_selector('input[name="username"]', timeout=30_000)
-            except Exception:
-                await page.goto(
-                    "https://dip.cezdistribuce.cz/irj/portal?zpnd",
-                    wait_until="domcontentloaded",
-                )
-                await page.wait_for_selector('input[name="username"]', timeout=120_000)
-
-            # Find login form (might be in iframe)
-            login_target = page
-            for frame in page.frames:
-                if await frame.locator('input[name="username"]').count() > 0:
-                    login_target = frame
-                    break
-
-            # Fill credentials
-            await login_target.fill('input[name="username"]', email)
-            await login_target.fill('input[name="password"]', password)
-
-            # Submit
-            submit = login_target.locator(
-                'input[type="submit"], button[type="submit"]'
-            ).first
-            await submit.click()
-
-            # Wait for success
-            import re
-
-            success_pattern = re.compile(
-                r".*/(cezpnd2/dashboard/|cezpnd2/external/dashboard/view|irj/portal).*"
-            )
-            await page.wait_for_url(success_pattern, timeout=120_000)
+            if not logged_in:
+                await login(page, email, password)
+                print("✓ Login successful")
 
-            print("✓ Login successful")
-
-            # Navigate to PND dashboard to establish session
-            await page.goto(
-                "https://pnd.cezdistribuce.cz/cezpnd2/dashboard/view",
-                wait_until="domcontentloaded",
-            )
-            await page.wait_for_timeout(5000)  # Wait for session
+                # Navigate to PND dashboard to establish session
+                await open_dashboard(page)
+                await save_storage_state(context, email)
 
             # Step 2: Fetch PND data using Playwright's request API
             print("Step 2: Fetching PND data...")
             today = datetime.now()
-            date_from = today.strftime("%d.%m.%Y 00:00")
-            date_to = today.strftime("%d.%m.%Y 23:59")
+            today_str = today.strftime("%d.%m.%Y")
+            date_from = f"{today_str} 00:00"
+            date_to = f"{today_str} 23:59"
 
             payload = build_pnd_payload(-1003, date_from, date_to, electrometer_id)
+            payload_json = dumps_compact(payload)
 
-            print(f"  Payload: {json.dumps(payload, indent=2)}")
+            print(f"  Payload: {payload_json}")
 
             # WAF warmup: Send JSON request first (will fail with 400, but sets WAF cookies/state)
+            # The form request depends on that state, so the two POSTs must stay
+            # serial - do not gather them.
             print("  WAF warmup (JSON request)...")
             try:
                 warmup_response = await context.request.post(
                     PND_DATA_URL,
-                    data=json.dumps(payload),
-                    headers={"Content-Type": "application/json"},
+                    data=payload_json,
+                    headers=JSON_HEADERS,
                 )
                 print(f"    Warmup status: {warmup_response.status} (expected 400)")
             except Exception as e:
@@ -171,18 +204,18 @@ async def async_main() -> int:
             print(f"  Response status: {response.status}")
             print(f"  Response URL: {response.url}")
 
-            raw_text = await response.text()
-            print(f"  Response length: {len(raw_text)} chars")
+            raw_body = await response.body()
+            print(f"  Response length: {len(raw_body)} bytes")
             try:
-                pnd_data = json.loads(raw_text)
-            except json.JSONDecodeError:
+                pnd_data = loads_json(raw_body)
+            except ValueError:
                 print("✗ Response is not valid JSON")
-                print(f"  Response preview: {raw_text[:1000]}")
+                print(f"  Response preview: {body_preview(raw_body, 1000)}")
                 return 1
 
             if response.status != 200:
                 print(f"✗ PND API returned {response.status}")
-                print(f"  Response preview: {raw_text[:500]}")
+                print(f"  Response preview: {body_preview(raw_body, 500)}")
                 return 1
 
             print(f"✓ PND data fetched, size: {pnd_data.get('size', 0)}")
@@ -196,7 +229,7 @@ async def async_main() -> int:
                     token_url = f"{DIP_PORTAL_URL}/{DIP_TOKEN_PATH}"
                     token_resp = await context.request.get(token_url)
                     if token_resp.status == 200:
-                        token_data = await token_resp.json()
+                        token_data = loads_json(await token_resp.body())
                         token = token_data.get("token")
 
                         # Get signals
@@ -207,11 +240,13 @@ async def async_main() -> int:
                             signals_url, headers={"x-request-token": token}
                         )
                         if signals_resp.status == 200:
-                            signals_data = await signals_resp.json()
+                            signals_data = loads_json(await signals_resp.body())
                             hdo_data = signals_data.get("data")
                             print("✓ HDO data fetched")
                 except Exception as exc:
                     print(f"⚠ HDO fetch failed: {exc}")
+                if hdo_data is None:
+                    print("⚠ No HDO data fetched; evidence will contain PND only")
 
             # Step 4: Prepare evidence data
             print("Step 4: Preparing evidence data...")
@@ -233,8 +268,7 @@ async def async_main() -> int:
             filename = f"pnd-{electrometer_id}-{timestamp}.json"
             filepath = evidence_dir / filename
 
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(evidence_data, f, indent=2, ensure_ascii=False)
+            write_evidence(filepath, evidence_data)
 
             print(f"✓ Evidence saved: {filepath}")
             print()
@@ -278,6 +312,7 @@ async def async_main() -> int:
 
 def main() -> int:
     """Entry point."""
+    configure_logging()
     return asyncio.run(async_main())
 
 
@@ -162,18 +162,26 @@ def validate_json_file(file_path: str) -> dict[str, Any]:
 
     if has_pnd:
         pnd_result = validate_pnd_data(data)
-        result["pnd"] = pnd_result["pnd"]
-        result["pnd_valid"] = pnd_result["valid"]
-        result["pnd_errors"] = pnd_result["errors"]
-        result["valid"] = result["valid"] and pnd_result["valid"]
+        result.update(
+            {
+                "pnd": pnd_result["pnd"],
+                "pnd_valid": pnd_result["valid"],
+                "pnd_errors": pnd_result["errors"],
+                "valid": result["valid"] and pnd_result["valid"],
+            }
+        )
         errors.extend(pnd_result["errors"])
 
     if has_hdo:
         hdo_result = validate_hdo_data(data)
-        result["hdo"] = hdo_result["hdo"]
-        result["hdo_valid"] = hdo_result["valid"]
-        result["hdo_errors"] = hdo_result["errors"]
-        result["valid"] = result["valid"] and hdo_result["valid"]
+        result.update(
+            {
+                "hdo": hdo_result["hdo"],
+                "hdo_valid": hdo_result["valid"],
+                "hdo_errors": hdo_result["errors"],
+                "valid": result["valid"] and hdo_result["valid"],
+            }
+        )
         errors.extend(hdo_result["errors"])
 
     return result
@@ -4,102 +4,104 @@ Usage:
     export CEZ_EMAIL="your-email"
     export CEZ_PASSWORD="your-password"
     export CEZ_EAN="1234567890123"
+    export CEZ_LOG="INFO"  # Optional: log the login flow (default WARNING)
 
     python3 scripts/test_shared_context_hypothesis.py
+
+orjson is used for JSON handling when installed (optional).
 """
 
 from __future__ import annotations
 
 import asyncio
-import json
 import os
-import re
 import sys
 from datetime import datetime
 from pathlib import Path
 
 from playwright.async_api import async_playwright
 
-from addon.src.auth import DEFAULT_USER_AGENT
+from addon.src.auth import block_heavy_resources
 from addon.src.dip_client import DIP_PORTAL_URL, SIGNALS_PATH_TEMPLATE
+from scripts.browser_pool import shared_browser
+from scripts.live_json import body_preview, dumps_evidence, loads_json
+from scripts.live_login import (
+    configure_logging,
+    context_options,
+    login,
+    open_dashboard,
+)
 
 TOKEN_PATH = "rest-auth-api?path=/token/get"
 
-DASHBOARD_URL = "https://pnd.cezdistribuce.cz/cezpnd2/dashboard/view"
-PND_ENTRY_URL = "https://pnd.cezdistribuce.cz/cezpnd2"
-DIP_FALLBACK_URL = "https://dip.cezdistribuce.cz/irj/portal?zpnd"
-
 
 async def login_flow(page) -> bool:
-    """Execute login flow. Returns True on success."""
-    await page.goto(PND_ENTRY_URL, wait_until="domcontentloaded")
-
-    try:
-        await page.wait_for_selector('input[name="username"]', timeout=30_000)
-    except Exception:
-        await page.goto(DIP_FALLBACK_URL, wait_until="domcontentloaded")
-        await page.wait_for_selector('input[name="username"]', timeout=120_000)
-
-    login_target = page
-    for frame in page.frames:
-        if await frame.locator('input[name="username"]').count() > 0:
-            login_target = frame
-            break
-
-    email = os.getenv("CEZ_EMAIL")
-    password = os.getenv("CEZ_PASSWORD")
-
-    await login_target.fill('input[name="username"]', email)
-    await login_target.fill('input[name="password"]', password)
-
-    submit = login_target.locator('input[type="submit"], button[type="submit"]').first
-    await submit.click()
-
-    success_pattern = re.compile(
-        r".*/(cezpnd2/dashboard/|cezpnd2/external/dashboard/view|irj/portal).*"
-    )
-    await page.wait_for_url(success_pattern, timeout=120_000)
+    """Execute login flow with the CEZ_EMAIL/CEZ_PASSWORD credentials."""
+    await login(page, os.getenv("CEZ_EMAIL"), os.getenv("CEZ_PASSWORD"))
     return True
 
 
-def create_context_options() -> dict:
-    """Get context creation options matching live_verify_flow.py (NO viewport)."""
-    return {
-        "user_agent": DEFAULT_USER_AGENT,
-        "locale": "cs-CZ",
-        "timezone_id": "Europe/Prague",
-    }
+class TokenUnavailable(Exception):
+    """Raised by get_token() with the (status, label, body_preview) to report."""
 
+    def __init__(self, status: int, label: str, body_preview: str) -> None:
+        super().__init__(label)
+        self.result = (status, label, body_preview)
 
-async def fetch_hdo_raw(context, ean: str) -> tuple[int, str, str]:
-    """Fetch HDO data and return (status, content_type, body_preview)."""
+
+async def get_token(context) -> str:
+    """Fetch a DIP request token through the context's cookie jar."""
     token_url = f"{DIP_PORTAL_URL}/{TOKEN_PATH}"
     token_resp = await context.request.get(token_url)
+    # Read the body once; every branch below parses or previews these bytes.
+    raw = await token_resp.body()
 
     if token_resp.status != 200:
-        body = await token_resp.text()
-        return token_resp.status, "token_failed", body[:200]
+        raise TokenUnavailable(
+            token_resp.status, "token_failed", body_preview(raw, 200)
+        )
 
     try:
-        token_data = await token_resp.json()
+        # ValueError covers both json.JSONDecodeError and orjson.JSONDecodeError
+        token_data = loads_json(raw)
         token = token_data.get("token")
-    except json.JSONDecodeError:
-        body = await token_resp.text()
-        return token_resp.status, "token_not_json", body[:200]
+    except ValueError:
+        raise TokenUnavailable(
+            token_resp.status, "token_not_json", body_preview(raw, 200)
+        )
 
     if not token:
-        body = await token_resp.text()
-        return token_resp.status, "token_missing", body[:200]
+        raise TokenUnavailable(
+            token_resp.status, "token_missing", body_preview(raw, 200)
+        )
+
+    return token
 
+
+async def get_signals(context, token: str, ean: str) -> tuple[int, str, str]:
+    """Fetch HDO signals for `ean` and return (status, content_type, body_preview)."""
     signals_url = f"{DIP_PORTAL_URL}/{SIGNALS_PATH_TEMPLATE.format(ean=ean)}"
     signals_resp = await context.request.get(
         signals_url, headers={"x-request-token": token}
     )
 
     content_type = signals_resp.headers.get("content-type", "")
-    body = await signals_resp.text()
+    preview = body_preview(await signals_resp.body(), 200)
 
-    return signals_resp.status, content_type, body[:200]
+    return signals_resp.status, content_type, preview
+
+
+async def fetch_hdo_raw(context, ean: str) -> tuple[int, str, str]:
+    """Fetch HDO data and return (status, content_type, body_preview).
+
+    The token does not depend on the EAN, so callers checking several EANs
+    can call get_token() once and gather get_signals() for each of them.
+    """
+    try:
+        token = await get_token(context)
+    except TokenUnavailable as exc:
+        return exc.result
+    return await get_signals(context, token, ean)
 
 
 async def test_a_fresh_context_fails(browser, ean: str) -> dict:
@@ -110,7 +112,8 @@ async def test_a_fresh_context_fails(browser, ean: str) -> dict:
 
     # Step 1: Login and extract cookies
     print("  Step 1: Login and extract cookies...")
-    context_login = await browser.new_context(**create_context_options())
+    context_login = await browser.new_context(**context_options())
+    await block_heavy_resources(context_login)
     page_login = await context_login.new_page()
 
     try:
@@ -129,7 +132,7 @@ async def test_a_fresh_context_fails(browser, ean: str) -> dict:
 
     # Step 3: Create NEW fresh context and inject cookies (PlaywrightHdoFetcher pattern)
     print("  Step 3: Create NEW context and inject cookies...")
-    context_fresh = await browser.new_context(**create_context_options())
+    context_fresh = await browser.new_context(**context_options())
     await context_fresh.add_cookies(cookies)
     print(f"    Injected {len(cookies)} cookies into fresh context")
 
@@ -175,7 +178,8 @@ async def test_b_shared_context_succeeds(browser, ean: str) -> dict:
 
     # Step 1: Login with context that will be reused
     print("  Step 1: Login (keeping same context)...")
-    context = await browser.new_context(**create_context_options())
+    context = await browser.new_context(**context_options())
+    await block_heavy_resources(context)
     page = await context.new_page()
 
     try:
@@ -185,11 +189,10 @@ async def test_b_shared_context_succeeds(browser, ean: str) -> dict:
         await context.close()
         return {"pass": False, "error": f"Login failed: {e}"}
 
-    # Step 2: Navigate to dashboard + 5s wait (critical for session)
-    print("  Step 2: Navigate to dashboard + 5s wait...")
-    await page.goto(DASHBOARD_URL, wait_until="domcontentloaded")
-    await page.wait_for_timeout(5000)
-    print("    Dashboard loaded, wait complete")
+    # Step 2: Navigate to dashboard and let it settle (critical for session)
+    print("  Step 2: Navigate to dashboard + wait for network idle...")
+    await open_dashboard(page)
+    print("    Dashboard loaded")
 
     # Step 3: Fetch HDO using SAME context
     print("  Step 3: Fetch HDO data (same context)...")
@@ -225,6 +228,32 @@ async def test_b_shared_context_succeeds(browser, ean: str) -> dict:
     return result
 
 
+EVIDENCE_FILE = Path(".sisyphus/evidence/task-1-hypothesis-test-output.txt")
+
+
+async def save_evidence(
+    ean: str, result_a: dict, result_b: dict, hypothesis_confirmed: bool
+) -> Path:
+    """Write both test results to EVIDENCE_FILE in a worker thread."""
+    evidence = (
+        "SHARED CONTEXT HYPOTHESIS TEST OUTPUT\n"
+        f"Time: {datetime.now().isoformat()}\n"
+        f"EAN: {ean}\n\n"
+        "TEST A (Fresh Context - should fail):\n"
+        f"  {dumps_evidence(result_a).decode()}\n\n"
+        "TEST B (Shared Context - should succeed):\n"
+        f"  {dumps_evidence(result_b).decode()}\n\n"
+        f"HYPOTHESIS CONFIRMED: {hypothesis_confirmed}\n"
+    )
+
+    def _write() -> None:
+        EVIDENCE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        EVIDENCE_FILE.write_text(evidence, encoding="utf-8")
+
+    await asyncio.to_thread(_write)
+    return EVIDENCE_FILE
+
+
 async def async_main() -> int:
     """Run both tests and report results."""
     email = os.getenv("CEZ_EMAIL")
@@ -243,27 +272,26 @@ async def async_main() -> int:
     print(f"EAN: {ean}")
     print(f"Time: {datetime.now().isoformat()}")
 
-    async with async_playwright() as playwright:
-        browser = await playwright.chromium.launch(headless=True)
-
-        try:
-            # Run Test A (should fail)
-            result_a = await test_a_fresh_context_fails(browser, ean)
-
-            # Run Test B (should succeed)
-            result_b = await test_b_shared_context_succeeds(browser, ean)
-
-        finally:
-            await browser.close()
+    async with async_playwright() as playwright, shared_browser(playwright) as browser:
+        # Test A (should fail) and Test B (should succeed) run one after the
+        # other: both log in to the same account, and an overlapping login
+        # could end the other's session and make Test A fail for the wrong
+        # reason.
+        result_a = await test_a_fresh_context_fails(browser, ean)
+        result_b = await test_b_shared_context_succeeds(browser, ean)
+        test_a_passed = result_a.get("expected_failure", False)
+        test_b_passed = result_b.get("has_hdo_data", False)
+        hypothesis_confirmed = test_a_passed and test_b_passed
+        # Write the evidence while the browser shuts down and the summary prints.
+        evidence_task = asyncio.create_task(
+            save_evidence(ean, result_a, result_b, hypothesis_confirmed)
+        )
 
     # Summary
     print("\n" + "=" * 60)
     print("SUMMARY")
     print("=" * 60)
 
-    test_a_passed = result_a.get("expected_failure", False)
-    test_b_passed = result_b.get("has_hdo_data", False)
-
     print(f"\nTest A (Fresh Context):     {'PASS' if test_a_passed else 'FAIL'}")
     print("  → Expected: HTML/error (reproduces broken pattern)")
     print(f"  → Got: status={result_a.get('status')}, html={result_a.get('is_html')}")
@@ -273,8 +301,6 @@ async def async_main() -> int:
     print(f"  → Got: status={result_b.get('status')}, json={result_b.get('is_json')}")
 
     # Final verdict
-    hypothesis_confirmed = test_a_passed and test_b_passed
-
     print("\n" + "=" * 60)
     if hypothesis_confirmed:
         print("HYPOTHESIS CONFIRMED: Shared context is required for HDO fetch")
@@ -285,27 +311,14 @@ async def async_main() -> int:
         print("  → Further investigation needed")
     print("=" * 60)
 
-    # Save evidence
-    evidence_dir = Path(".sisyphus/evidence")
-    evidence_dir.mkdir(parents=True, exist_ok=True)
-    evidence_file = evidence_dir / "task-1-hypothesis-test-output.txt"
-
-    with open(evidence_file, "w") as f:
-        f.write("SHARED CONTEXT HYPOTHESIS TEST OUTPUT\n")
-        f.write(f"Time: {datetime.now().isoformat()}\n")
-        f.write(f"EAN: {ean}\n\n")
-        f.write("TEST A (Fresh Context - should fail):\n")
-        f.write(f"  {json.dumps(result_a, indent=2)}\n\n")
-        f.write("TEST B (Shared Context - should succeed):\n")
-        f.write(f"  {json.dumps(result_b, indent=2)}\n\n")
-        f.write(f"HYPOTHESIS CONFIRMED: {hypothesis_confirmed}\n")
-
+    evidence_file = await evidence_task
     print(f"\nEvidence saved to: {evidence_file}")
 
     return 0 if hypothesis_confirmed else 1
 
 
 def main() -> int:
+    configure_logging()
     return asyncio.run(async_main())
 
 
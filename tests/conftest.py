@@ -13,6 +13,72 @@ from unittest.mock import AsyncMock
 
 import pytest
 
+# HTML bodies for the DIP HTML response fixtures
+_MAINTENANCE_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Údržba systému | CEZ Distribuce</title>
+</head>
+<body>
+    <h1>Plánovaná údržba</h1>
+    <p>Systém DIP je momentálně nedostupný z důvodu plánované údržby.</p>
+    <p>Omlouváme se za nepříjemnosti.</p>
+</body>
+</html>"""
+
+_LOGIN_PAGE_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Přihlášení | CEZ Distribuce</title>
+</head>
+<body>
+    <form id="loginForm">
+        <input type="text" name="username" />
+        <input type="password" name="password" />
+        <button type="submit">Přihlásit</button>
+    </form>
+</body>
+</html>"""
+
+_SERVICE_UNAVAILABLE_HTML = """\
+<!DOCTYPE html>
+<html>
+<head><title>Service Unavailable</title></head>
+<body>
+    <h1>503 Service Unavailable</h1>
+    <p>The server is temporarily unable to service your request.</p>
+</body>
+</html>"""
+
+
+class _StubResponse:
+    """Plain stand-in for responses that only carry a status and headers.
+
+    Cheaper than an AsyncMock and strict: touching anything else raises
+    AttributeError instead of silently returning a child mock.
+    """
+
+    def __init__(
+        self,
+        status: int,
+        headers: dict[str, str] | None = None,
+        json_value: Any = None,
+        text_value: str = "",
+    ) -> None:
+        self.status = status
+        self.headers = headers or {}
+        self._json_value = json_value
+        self._text_value = text_value
+
+    async def json(self) -> Any:
+        return self._json_value
+
+    async def text(self) -> str:
+        return self._text_value
+
+
 # =============================================================================
 # PND API Response Fixtures (301/302 redirects, JSON data)
 # =============================================================================
@@ -29,56 +95,48 @@ def pnd_json_response() -> AsyncMock:
     response = AsyncMock()
     response.status = 200
     response.headers = {"content-type": "application/json"}
-    response.json = AsyncMock(
-        return_value={
-            "hasData": True,
-            "columns": [
-                {"id": "1000", "name": "Datum", "unit": None},
-                {"id": "1001", "name": "+A/784703", "unit": "kW"},
-                {"id": "1002", "name": "-A/784703", "unit": "kW"},
-                {"id": "1003", "name": "Rv/784703", "unit": "kW"},
-            ],
-            "values": [
-                {
-                    "1000": {"v": "14.02.2026 00:15"},
-                    "1001": {"v": "1,42", "s": 32},
-                    "1002": {"v": "0,05", "s": 32},
-                    "1003": {"v": "5,46", "s": 32},
-                },
-            ],
-        }
-    )
+    response.json.return_value = {
+        "hasData": True,
+        "columns": [
+            {"id": "1000", "name": "Datum", "unit": None},
+            {"id": "1001", "name": "+A/784703", "unit": "kW"},
+            {"id": "1002", "name": "-A/784703", "unit": "kW"},
+            {"id": "1003", "name": "Rv/784703", "unit": "kW"},
+        ],
+        "values": [
+            {
+                "1000": {"v": "14.02.2026 00:15"},
+                "1001": {"v": "1,42", "s": 32},
+                "1002": {"v": "0,05", "s": 32},
+                "1003": {"v": "5,46", "s": 32},
+            },
+        ],
+    }
     return response
 
 
 @pytest.fixture
-def pnd_301_redirect_response() -> AsyncMock:
+def pnd_301_redirect_response() -> _StubResponse:
     """PND 301 Permanent Redirect response.
 
     Simulates session expiry / permanent redirect scenario.
-    Returns AsyncMock with:
+    Returns _StubResponse with:
     - status: 301
     - headers: Location header with redirect URL
     """
-    response = AsyncMock()
-    response.status = 301
-    response.headers = {"Location": "https://pnd.cezdistribuce.cz/login"}
-    return response
+    return _StubResponse(301, {"Location": "https://pnd.cezdistribuce.cz/login"})
 
 
 @pytest.fixture
-def pnd_302_redirect_response() -> AsyncMock:
+def pnd_302_redirect_response() -> _StubResponse:
     """PND 302 Found redirect response.
 
     Simulates OAuth redirect / temporary redirect scenario (session expired).
-    Returns AsyncMock with:
+    Returns _StubResponse with:
     - status: 302
     - headers: Location header with redirect URL
     """
-    response = AsyncMock()
-    response.status = 302
-    response.headers = {"Location": "https://dip.cezdistribuce.cz/irj/portal"}
-    return response
+    return _StubResponse(302, {"Location": "https://dip.cezdistribuce.cz/irj/portal"})
 
 
 @pytest.fixture
@@ -92,24 +150,20 @@ def pnd_no_data_response() -> AsyncMock:
     """
     response = AsyncMock()
     response.status = 200
-    response.json = AsyncMock(
-        return_value={"hasData": False, "columns": [], "values": []}
-    )
+    response.json.return_value = {"hasData": False, "columns": [], "values": []}
     return response
 
 
 @pytest.fixture
-def pnd_waf_warmup_response() -> AsyncMock:
+def pnd_waf_warmup_response() -> _StubResponse:
     """PND WAF warmup response (expected 400 Bad Request).
 
     The first POST request to PND API intentionally gets 400 to set
     WAF cookies/state. Second request with form-encoded data succeeds.
-    Returns AsyncMock with:
+    Returns _StubResponse with:
     - status: 400 (expected for warmup)
     """
-    response = AsyncMock()
-    response.status = 400
-    return response
+    return _StubResponse(400)
 
 
 # =============================================================================
@@ -128,17 +182,15 @@ def dip_json_response() -> AsyncMock:
     """
     response = AsyncMock()
     response.status = 200
-    response.json = AsyncMock(
-        return_value={
-            "token": "test-token-abc123",
-            "data": {
-                "signal": "EVV2",
-                "den": "Pondělí",
-                "datum": "16.02.2026",
-                "casy": "00:00-08:00; 09:00-12:00; 13:00-15:00; 16:00-19:00; 20:00-24:00",
-            },
-        }
-    )
+    response.json.return_value = {
+        "token": "test-token-abc123",
+        "data": {
+            "signal": "EVV2",
+            "den": "Pondělí",
+            "datum": "16.02.2026",
+            "casy": "00:00-08:00; 09:00-12:00; 13:00-15:00; 16:00-19:00; 20:00-24:00",
+        },
+    }
     return response
 
 
@@ -152,7 +204,7 @@ def dip_token_response() -> AsyncMock:
     """
     response = AsyncMock()
     response.status = 200
-    response.json = AsyncMock(return_value={"token": "test-token-xyz789"})
+    response.json.return_value = {"token": "test-token-xyz789"}
     return response
 
 
@@ -169,19 +221,7 @@ def dip_html_maintenance_response() -> AsyncMock:
     response = AsyncMock()
     response.status = 200
     response.headers = {"Content-Type": "text/html; charset=UTF-8"}
-    response.text = AsyncMock(return_value="""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Údržba systému | CEZ Distribuce</title>
-</head>
-<body>
-    <h1>Plánovaná údržba</h1>
-    <p>Systém DIP je momentálně nedostupný z důvodu plánované údržby.</p>
-    <p>Omlouváme se za nepříjemnosti.</p>
-</body>
-</html>
-        """.strip())
+    response.text.return_value = _MAINTENANCE_HTML
     return response
 
 
@@ -197,35 +237,19 @@ def dip_html_login_page_response() -> AsyncMock:
     response = AsyncMock()
     response.status = 200
     response.headers = {"Content-Type": "text/html; charset=UTF-8"}
-    response.text = AsyncMock(return_value="""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Přihlášení | CEZ Distribuce</title>
-</head>
-<body>
-    <form id="loginForm">
-        <input type="text" name="username" />
-        <input type="password" name="password" />
-        <button type="submit">Přihlásit</button>
-    </form>
-</body>
-</html>
-        """.strip())
+    response.text.return_value = _LOGIN_PAGE_HTML
     return response
 
 
 @pytest.fixture
-def dip_401_unauthorized_response() -> AsyncMock:
+def dip_401_unauthorized_response() -> _StubResponse:
     """DIP 401 Unauthorized response.
 
     Used for testing token refresh / re-auth scenarios.
-    Returns AsyncMock with:
+    Returns _StubResponse with:
     - status: 401
     """
-    response = AsyncMock()
-    response.status = 401
-    return response
+    return _StubResponse(401)
 
 
 @pytest.fixture
@@ -240,16 +264,7 @@ def dip_503_service_unavailable_response() -> AsyncMock:
     response = AsyncMock()
     response.status = 503
     response.headers = {"Content-Type": "text/html; charset=UTF-8"}
-    response.text = AsyncMock(return_value="""
-<!DOCTYPE html>
-<html>
-<head><title>Service Unavailable</title></head>
-<body>
-    <h1>503 Service Unavailable</h1>
-    <p>The server is temporarily unable to service your request.</p>
-</body>
-</html>
-        """.strip())
+    response.text.return_value = _SERVICE_UNAVAILABLE_HTML
     return response
 
 
@@ -281,18 +296,20 @@ def sample_cookies() -> list[dict[str, Any]]:
 
 
 @pytest.fixture
-def mock_playwright_response(pnd_json_response: AsyncMock) -> AsyncMock:
+def mock_playwright_response(request: pytest.FixtureRequest) -> AsyncMock:
     """Playwright APIResponse mock.
 
     Returns AsyncMock with:
     - status: from pnd_json_response
     - json(): from pnd_json_response
     - url(): Returns mock URL
+
+    pnd_json_response is resolved by name when this fixture runs, so it is
+    not part of the static fixture graph; a test that also requests it gets
+    the same object.
     """
-    response = pnd_json_response
-    response.url = AsyncMock(
-        return_value="https://pnd.cezdistribuce.cz/cezpnd2/external/data"
-    )
+    response = request.getfixturevalue("pnd_json_response")
+    response.url.return_value = "https://pnd.cezdistribuce.cz/cezpnd2/external/data"
     return response
 
 
@@ -307,32 +324,20 @@ def mock_playwright_context() -> AsyncMock:
     - request: Request mock with post() returning mock response
     """
     context = AsyncMock()
-    context.add_cookies = AsyncMock()
-    context.cookies = AsyncMock(
-        return_value=[
-            {
-                "name": "JSESSIONID",
-                "value": "test-session-xyz789",
-                "domain": ".cezdistribuce.cz",
-                "path": "/",
-            }
-        ]
-    )
-    context.close = AsyncMock()
+    context.cookies.return_value = [
+        {
+            "name": "JSESSIONID",
+            "value": "test-session-xyz789",
+            "domain": ".cezdistribuce.cz",
+            "path": "/",
+        }
+    ]
 
     # Mock request.post
-    mock_request = AsyncMock()
     mock_response = AsyncMock()
     mock_response.status = 200
-    mock_response.json = AsyncMock(
-        return_value={
-            "hasData": True,
-            "columns": [],
-            "values": [],
-        }
-    )
-    mock_request.post = AsyncMock(return_value=mock_response)
-    context.request = mock_request
+    mock_response.json.return_value = {"hasData": True, "columns": [], "values": []}
+    context.request.post.return_value = mock_response
 
     return context
 
@@ -346,8 +351,7 @@ def mock_playwright_browser(mock_playwright_context: AsyncMock) -> AsyncMock:
     - close(): AsyncMock
     """
     browser = AsyncMock()
-    browser.new_context = AsyncMock(return_value=mock_playwright_context)
-    browser.close = AsyncMock()
+    browser.new_context.return_value = mock_playwright_context
     return browser
 
 
@@ -356,16 +360,16 @@ def mock_playwright_launch(mock_playwright_browser: AsyncMock) -> AsyncMock:
     """Playwright launch mock (complete stack).
 
     Returns AsyncMock that acts as async context manager:
-    - __aenter__: Returns Browser mock
-    - __aexit__: Returns None
+    - __aenter__: Returns Playwright mock whose chromium.launch() returns
+      the Browser mock
+    - __aexit__: Returns False
     """
     mock_pw = AsyncMock()
-    mock_pw.chromium = AsyncMock()
-    mock_pw.chromium.launch = AsyncMock(return_value=mock_playwright_browser)
+    mock_pw.chromium.launch.return_value = mock_playwright_browser
 
     mock_async_pw = AsyncMock()
-    mock_async_pw.__aenter__ = AsyncMock(return_value=mock_pw)
-    mock_async_pw.__aexit__ = AsyncMock(return_value=False)
+    mock_async_pw.__aenter__.return_value = mock_pw
+    mock_async_pw.__aexit__.return_value = False
 
     return mock_async_pw
 
@@ -384,18 +388,17 @@ def mock_aiohttp_session() -> AsyncMock:
     - close(): AsyncMock
     """
     session = AsyncMock()
-    session.close = AsyncMock()
 
     # Create async context manager for response
     mock_response = AsyncMock()
     mock_response.status = 200
-    mock_response.json = AsyncMock(return_value={"data": "test"})
+    mock_response.json.return_value = {"data": "test"}
     mock_response.headers = {}
 
     mock_cm = AsyncMock()
-    mock_cm.__aenter__ = AsyncMock(return_value=mock_response)
-    mock_cm.__aexit__ = AsyncMock(return_value=None)
+    mock_cm.__aenter__.return_value = mock_response
+    mock_cm.__aexit__.return_value = None
 
-    session.get = AsyncMock(return_value=mock_cm)
+    session.get.return_value = mock_cm
 
     return session
@@ -2,10 +2,17 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from addon.src.auth import AuthSession, PlaywrightAuthClient
+from addon.src.auth import (
+    BLOCKED_ASSET_PATTERN,
+    LOGIN_SUCCESS_PATTERN,
+    AuthSession,
+    PlaywrightAuthClient,
+    _get_login_target,
+)
 from addon.src.session_manager import (
     Credentials,
     CredentialsProvider,
@@ -52,8 +59,6 @@ async def test_login_persists_cookies(tmp_path) -> None:
 
 @pytest.mark.asyncio
 async def test_restore_session_avoids_login(tmp_path) -> None:
-    from unittest.mock import MagicMock
-
     session_path = tmp_path / "session.json"
     store = SessionStore(path=session_path, ttl=timedelta(hours=6))
     now = datetime.now(tz=timezone.utc)
@@ -167,3 +172,87 @@ async def test_expired_session_triggers_login(tmp_path) -> None:
     assert called["count"] == 1
     assert session.reused is False
     assert session.cookies[0]["value"] == "new"
+
+
+def _frame_with_inputs(username: int, password: int):
+    counts = {'input[name="username"]': username, 'input[name="password"]': password}
+    frame = MagicMock()
+    frame.locator.side_effect = lambda selector: MagicMock(
+        count=AsyncMock(return_value=counts[selector])
+    )
+    return frame
+
+
+@pytest.mark.asyncio
+async def test_login_target_prefers_frame_with_both_inputs() -> None:
+    main_frame = _frame_with_inputs(username=1, password=0)
+    login_frame = _frame_with_inputs(username=1, password=1)
+    page = MagicMock()
+    page.frames = [main_frame, login_frame]
+
+    assert await _get_login_target(page) is login_frame
+
+
+@pytest.mark.asyncio
+async def test_login_target_skips_detached_frame() -> None:
+    detached_frame = MagicMock()
+    detached_frame.locator.return_value.count = AsyncMock(
+        side_effect=RuntimeError("Frame was detached")
+    )
+    login_frame = _frame_with_inputs(username=1, password=1)
+    page = MagicMock()
+    page.frames = [detached_frame, login_frame]
+
+    assert await _get_login_target(page) is login_frame
+
+
+@pytest.mark.asyncio
+async def test_login_target_falls_back_to_page() -> None:
+    page = MagicMock()
+    page.frames = [_frame_with_inputs(0, 0), _frame_with_inputs(0, 1)]
+
+    assert await _get_login_target(page) is page
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://pnd.cezdistribuce.cz/cezpnd2/img/logo.PNG",
+        "https://pnd.cezdistribuce.cz/cezpnd2/fonts/roboto.woff2?v=3",
+    ],
+)
+def test_blocked_asset_pattern_matches_assets(url):
+    assert BLOCKED_ASSET_PATTERN.search(url)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://pnd.cezdistribuce.cz/cezpnd2/external/data",
+        "https://pnd.cezdistribuce.cz/cezpnd2/main.js",
+        "https://pnd.cezdistribuce.cz/cezpnd2/styles.css",
+    ],
+)
+def test_blocked_asset_pattern_keeps_data_scripts_and_styles(url):
+    assert not BLOCKED_ASSET_PATTERN.search(url)
+
+
+def test_session_store_save_replaces_file_atomically(tmp_path) -> None:
+    session_path = tmp_path / "session.json"
+    session_path.write_text("stale", encoding="utf-8")
+    store = SessionStore(path=session_path, ttl=timedelta(hours=1))
+
+    store.save([{"name": "JSESSIONID", "value": "abc", "expires": 0}])
+
+    assert store.load() is not None
+    assert [p.name for p in tmp_path.iterdir()] == ["session.json"]
+
+
+def test_login_success_pattern_matches_post_login_urls() -> None:
+    assert LOGIN_SUCCESS_PATTERN.search(
+        "https://pnd.cezdistribuce.cz/cezpnd2/dashboard/view"
+    )
+    assert LOGIN_SUCCESS_PATTERN.search("https://dip.cezdistribuce.cz/irj/portal")
+    assert not LOGIN_SUCCESS_PATTERN.search(
+        "https://cas.cez.cz/cas/login?service=https%3A%2F%2Fpnd.cezdistribuce.cz"
+    )
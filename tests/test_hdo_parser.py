@@ -176,37 +176,29 @@ class TestFindNextSwitch:
         ("20:00", "24:00"),
     ]
 
-    def test_at_0300_next_switch_is_0800(self) -> None:
-        now = datetime(2026, 2, 15, 3, 0)
-        result = _find_next_switch(now, self.SCHEDULE)
-        assert result == datetime(2026, 2, 15, 8, 0)
-
-    def test_at_0830_next_switch_is_0900(self) -> None:
-        now = datetime(2026, 2, 15, 8, 30)
-        result = _find_next_switch(now, self.SCHEDULE)
-        assert result == datetime(2026, 2, 15, 9, 0)
-
-    def test_at_1230_next_switch_is_1300(self) -> None:
-        now = datetime(2026, 2, 15, 12, 30)
-        result = _find_next_switch(now, self.SCHEDULE)
-        assert result == datetime(2026, 2, 15, 13, 0)
-
-    def test_at_1930_next_switch_is_2000(self) -> None:
-        now = datetime(2026, 2, 15, 19, 30)
-        result = _find_next_switch(now, self.SCHEDULE)
-        assert result == datetime(2026, 2, 15, 20, 0)
-
-    def test_at_2200_wraps_to_next_day(self) -> None:
-        """After last boundary (20:00), next is 00:00 tomorrow (first boundary)."""
-        now = datetime(2026, 2, 15, 22, 0)
-        result = _find_next_switch(now, self.SCHEDULE)
-        assert result == datetime(2026, 2, 16, 0, 0)
-
-    def test_at_0000_next_switch_is_0800(self) -> None:
-        """At exact midnight, next boundary after 00:00 is 08:00."""
-        now = datetime(2026, 2, 15, 0, 0)
-        result = _find_next_switch(now, self.SCHEDULE)
-        assert result == datetime(2026, 2, 15, 8, 0)
+    @pytest.mark.parametrize(
+        ("now", "expected"),
+        [
+            (datetime(2026, 2, 15, 3, 0), datetime(2026, 2, 15, 8, 0)),
+            (datetime(2026, 2, 15, 8, 30), datetime(2026, 2, 15, 9, 0)),
+            (datetime(2026, 2, 15, 12, 30), datetime(2026, 2, 15, 13, 0)),
+            (datetime(2026, 2, 15, 19, 30), datetime(2026, 2, 15, 20, 0)),
+            # After the last boundary (20:00), next is 00:00 tomorrow.
+            (datetime(2026, 2, 15, 22, 0), datetime(2026, 2, 16, 0, 0)),
+            # At exact midnight, the next boundary after 00:00 is 08:00.
+            (datetime(2026, 2, 15, 0, 0), datetime(2026, 2, 15, 8, 0)),
+        ],
+        ids=[
+            "0300_to_0800",
+            "0830_to_0900",
+            "1230_to_1300",
+            "1930_to_2000",
+            "2200_wraps_to_next_day",
+            "0000_to_0800",
+        ],
+    )
+    def test_next_switch(self, now: datetime, expected: datetime) -> None:
+        assert _find_next_switch(now, self.SCHEDULE) == expected
 
     def test_empty_schedule_returns_next_day_midnight(self) -> None:
         """When schedule is empty (no valid slots), return next day at midnight."""
@@ -221,19 +213,18 @@ class TestFindNextSwitch:
 class TestParseHdoSignals:
     """Verify end-to-end HDO signal parsing."""
 
+    NOW = datetime(2026, 2, 15, 10, 0)  # inside the 09:00-12:00 window
+
     def test_returns_hdo_data_instance(self) -> None:
-        now = datetime(2026, 2, 15, 10, 0)
-        result = parse_hdo_signals(FAKE_HDO_DATA, now=now)
+        result = parse_hdo_signals(FAKE_HDO_DATA, now=self.NOW)
         assert isinstance(result, HdoData)
 
     def test_signal_name_extracted(self) -> None:
-        now = datetime(2026, 2, 15, 10, 0)
-        result = parse_hdo_signals(FAKE_HDO_DATA, now=now)
+        result = parse_hdo_signals(FAKE_HDO_DATA, now=self.NOW)
         assert result.signal_name == "EVV2"
 
     def test_schedule_parsed_correctly(self) -> None:
-        now = datetime(2026, 2, 15, 10, 0)
-        result = parse_hdo_signals(FAKE_HDO_DATA, now=now)
+        result = parse_hdo_signals(FAKE_HDO_DATA, now=self.NOW)
         assert result.today_schedule == [
             ("00:00", "08:00"),
             ("09:00", "12:00"),
@@ -244,8 +235,7 @@ class TestParseHdoSignals:
 
     def test_low_tariff_during_window(self) -> None:
         """10:00 is within 09:00-12:00 → low tariff."""
-        now = datetime(2026, 2, 15, 10, 0)
-        result = parse_hdo_signals(FAKE_HDO_DATA, now=now)
+        result = parse_hdo_signals(FAKE_HDO_DATA, now=self.NOW)
         assert result.is_low_tariff is True
 
     def test_high_tariff_outside_window(self) -> None:
@@ -255,8 +245,7 @@ class TestParseHdoSignals:
         assert result.is_low_tariff is False
 
     def test_next_switch_calculated(self) -> None:
-        now = datetime(2026, 2, 15, 10, 0)
-        result = parse_hdo_signals(FAKE_HDO_DATA, now=now)
+        result = parse_hdo_signals(FAKE_HDO_DATA, now=self.NOW)
         assert result.next_switch == datetime(2026, 2, 15, 12, 0)
 
     def test_next_switch_during_high_tariff(self) -> None:
@@ -265,13 +254,11 @@ class TestParseHdoSignals:
         assert result.next_switch == datetime(2026, 2, 15, 9, 0)
 
     def test_is_low_tariff_is_bool(self) -> None:
-        now = datetime(2026, 2, 15, 10, 0)
-        result = parse_hdo_signals(FAKE_HDO_DATA, now=now)
+        result = parse_hdo_signals(FAKE_HDO_DATA, now=self.NOW)
         assert isinstance(result.is_low_tariff, bool)
 
     def test_next_switch_is_datetime(self) -> None:
-        now = datetime(2026, 2, 15, 10, 0)
-        result = parse_hdo_signals(FAKE_HDO_DATA, now=now)
+        result = parse_hdo_signals(FAKE_HDO_DATA, now=self.NOW)
         assert isinstance(result.next_switch, datetime)
 
     def test_raises_on_empty_signals(self) -> None:
@@ -289,8 +276,7 @@ class TestParseHdoSignals:
 
     def test_works_with_nested_data_structure(self) -> None:
         """parse_hdo_signals takes the 'data' portion, not the full response."""
-        now = datetime(2026, 2, 15, 10, 0)
-        result = parse_hdo_signals(FAKE_HDO_DATA_FULL["data"], now=now)
+        result = parse_hdo_signals(FAKE_HDO_DATA_FULL["data"], now=self.NOW)
         assert result.signal_name == "EVV2"
         assert result.is_low_tariff is True
 
@@ -5,7 +5,14 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from addon.src.main import PND_DATA_URL, PndFetcher, PndFetchError, build_pnd_payload
+from addon.src.auth import CHROMIUM_LAUNCH_ARGS
+from addon.src.main import (
+    PND_DATA_URL,
+    PndFetcher,
+    PndFetchError,
+    _body_preview,
+    build_pnd_payload,
+)
 from addon.src.orchestrator import SessionExpiredError
 
 SAMPLE_COOKIES: list[dict[str, Any]] = [
@@ -57,6 +64,19 @@ def _build_playwright_mocks(
     return mock_async_pw, mock_browser, mock_context
 
 
+async def _fetch_without_pauses(mock_pw: AsyncMock) -> AsyncMock:
+    """Run a sample PndFetcher.fetch() on the mocks; return the patched sleep."""
+    with patch("addon.src.main._get_async_playwright", return_value=lambda: mock_pw):
+        with patch("addon.src.main.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            await PndFetcher().fetch(
+                SAMPLE_COOKIES,
+                assembly_id=-1003,
+                date_from="14.02.2026 00:00",
+                date_to="14.02.2026 00:00",
+            )
+    return mock_sleep
+
+
 class TestBuildPndPayload:
 
     def test_builds_correct_payload_structure(self) -> None:
@@ -187,6 +207,61 @@ class TestPndFetcher:
         mock_context.close.assert_called_once()
         mock_browser.close.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_dashboard_waits_for_network_idle(self) -> None:
+        mock_pw, _, mock_context = _build_playwright_mocks()
+        mock_page = mock_context.new_page.return_value
+
+        mock_sleep = await _fetch_without_pauses(mock_pw)
+
+        mock_page.wait_for_load_state.assert_awaited_once_with(
+            "networkidle", timeout=3_000
+        )
+        mock_page.close.assert_awaited_once()
+        # Only the 1 s WAF warmup pause remains
+        mock_sleep.assert_awaited_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_dashboard_idle_timeout_is_non_fatal(self) -> None:
+        mock_pw, _, mock_context = _build_playwright_mocks()
+        mock_page = mock_context.new_page.return_value
+        mock_page.wait_for_load_state.side_effect = TimeoutError("not idle")
+
+        await _fetch_without_pauses(mock_pw)
+
+        mock_page.close.assert_awaited_once()
+        mock_context.request.post.assert_awaited()
+
+    @pytest.mark.asyncio
+    async def test_dashboard_page_closed_when_navigation_fails(self) -> None:
+        mock_pw, _, mock_context = _build_playwright_mocks()
+        mock_page = mock_context.new_page.return_value
+        mock_page.goto.side_effect = TimeoutError("navigation timeout")
+
+        await _fetch_without_pauses(mock_pw)
+
+        mock_page.wait_for_load_state.assert_not_awaited()
+        mock_page.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_context_loads_assets_unfiltered(self) -> None:
+        # The WAF fingerprint comes from a full dashboard load; asset
+        # blocking is limited to the live scripts.
+        mock_pw, _, mock_context = _build_playwright_mocks()
+
+        await _fetch_without_pauses(mock_pw)
+
+        mock_context.route.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_browser_launched_with_shared_args(self) -> None:
+        mock_pw, _, _ = _build_playwright_mocks()
+        launch = mock_pw.__aenter__.return_value.chromium.launch
+
+        await _fetch_without_pauses(mock_pw)
+
+        launch.assert_awaited_once_with(headless=True, args=CHROMIUM_LAUNCH_ARGS)
+
     @pytest.mark.asyncio
     async def test_browser_closed_after_error(self) -> None:
         mock_pw, mock_browser, mock_context = _build_playwright_mocks()
@@ -320,7 +395,7 @@ class TestFetchOneInContext:
         response.status = status
         response.headers = {"content-type": content_type}
         response.json = AsyncMock(return_value=response_data or SAMPLE_RESPONSE)
-        response.text = AsyncMock(return_value="<html>error</html>")
+        response.body = AsyncMock(return_value=b"<html>error</html>")
 
         mock_context = AsyncMock()
         mock_context.request.post = AsyncMock(return_value=response)
@@ -518,7 +593,7 @@ class TestPndFetcherErrorPaths:
         mock_pw, _, mock_context = _build_playwright_mocks()
         response = mock_context.request.post.return_value
         response.headers = {"content-type": "text/html; charset=UTF-8"}
-        response.text = AsyncMock(return_value="<html>error</html>")
+        response.body = AsyncMock(return_value=b"<html>error</html>")
 
         with patch(
             "addon.src.main._get_async_playwright", return_value=lambda: mock_pw
@@ -540,7 +615,7 @@ class TestPndFetcherErrorPaths:
         response = mock_context.request.post.return_value
         response.headers = {"content-type": "application/json"}
         response.json = AsyncMock(side_effect=ValueError("invalid json"))
-        response.text = AsyncMock(return_value="not-json-body")
+        response.body = AsyncMock(return_value=b"not-json-body")
 
         with patch(
             "addon.src.main._get_async_playwright", return_value=lambda: mock_pw
@@ -555,3 +630,22 @@ class TestPndFetcherErrorPaths:
                 )
 
         assert "JSON parse failed" in str(exc_info.value)
+
+
+class TestBodyPreview:
+
+    @pytest.mark.asyncio
+    async def test_decodes_only_the_limit(self) -> None:
+        response = AsyncMock()
+        response.body = AsyncMock(return_value="é".encode() * 400)
+
+        preview = await _body_preview(response, limit=500)
+
+        assert preview == "é" * 250
+
+    @pytest.mark.asyncio
+    async def test_unreadable_body(self) -> None:
+        response = AsyncMock()
+        response.body = AsyncMock(side_effect=RuntimeError("disposed"))
+
+        assert await _body_preview(response) == "(body unavailable)"